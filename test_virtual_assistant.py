@@ -0,0 +1,258 @@
+import copy
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+import virtual_assistant
+from virtual_assistant import AddressBook, Birthday, Record, _birthday_key
+
+
+def make_record(name, birthday=None):
+    record = Record(name)
+    if birthday is not None:
+        record.add_birthday(birthday)
+    return record
+
+
+def tomorrow():
+    """День народження, який точно потрапляє у найближчі 7 днів."""
+    return (date.today() + timedelta(days=1)).strftime("%d.%m.2000")
+
+
+class BirthdayIndexTest(unittest.TestCase):
+    """Перевіряє, що індекс днів народження відповідає записам книги."""
+
+    def assertIndexConsistent(self, book):
+        self.assertEqual(book._birthday_keys, sorted(book._birthday_keys))
+        owned = {name: record for name, record in book.data.items() if record._book is book}
+        expected = sorted(
+            (_birthday_key(record.birthday.month, record.birthday.day), name)
+            for name, record in owned.items()
+            if record.birthday is not None
+        )
+        actual = sorted(zip(book._birthday_keys, book._birthday_names))
+        self.assertEqual(actual, expected)
+        self.assertEqual(set(book._shared_names), set(book.data) - set(owned))
+
+    def upcoming_names(self, book):
+        return [item["name"] for item in book.get_upcoming_birthdays()]
+
+    def test_add_record(self):
+        book = AddressBook()
+        book.add_record(make_record("Amy", "01.02.2000"))
+        book.add_record(make_record("Bob"))
+        self.assertIndexConsistent(book)
+
+    def test_replace_record(self):
+        book = AddressBook()
+        book.add_record(make_record("Amy", "01.02.2000"))
+        book.add_record(make_record("Amy", "03.04.2000"))
+        self.assertIndexConsistent(book)
+        self.assertEqual(len(book._birthday_names), 1)
+
+    def test_delete(self):
+        book = AddressBook()
+        book.add_record(make_record("Amy", tomorrow()))
+        self.assertEqual(self.upcoming_names(book), ["Amy"])
+        self.assertTrue(book.delete("Amy"))
+        self.assertFalse(book.delete("Amy"))
+        self.assertIndexConsistent(book)
+        self.assertEqual(self.upcoming_names(book), [])
+
+    def test_add_birthday_after_add_record(self):
+        book = AddressBook()
+        record = make_record("Amy")
+        book.add_record(record)
+        record.add_birthday("01.02.2000")
+        record.add_birthday(tomorrow())
+        self.assertIndexConsistent(book)
+        self.assertEqual(self.upcoming_names(book), ["Amy"])
+
+    def test_record_in_two_books(self):
+        first, second = AddressBook(), AddressBook()
+        record = make_record("Amy")
+        first.add_record(record)
+        second.add_record(record)
+        record.add_birthday(tomorrow())
+        self.assertEqual(self.upcoming_names(first), ["Amy"])
+        self.assertEqual(self.upcoming_names(second), ["Amy"])
+        self.assertIndexConsistent(first)
+        self.assertIndexConsistent(second)
+        first.delete("Amy")
+        record.add_birthday("01.02.2000")
+        self.assertEqual(self.upcoming_names(second), [])
+
+    def test_birthday_assignment_updates_index(self):
+        book = AddressBook()
+        record = make_record("Amy", "01.02.2000")
+        book.add_record(record)
+        record.birthday = Birthday(tomorrow())
+        self.assertIndexConsistent(book)
+        self.assertEqual(self.upcoming_names(book), ["Amy"])
+
+    def test_key_must_match_record_name(self):
+        book = AddressBook()
+        with self.assertRaises(ValueError):
+            book["X"] = make_record("Y")
+        self.assertEqual(len(book), 0)
+
+    def test_upcoming_order_across_new_year(self):
+        class FakeDate(date):
+            @classmethod
+            def today(cls):
+                return cls(2026, 12, 29)
+
+        book = AddressBook()
+        for name, birthday in (("Jan", "02.01.1990"), ("Dec", "30.12.1990"),
+                               ("NewYear", "01.01.1990"), ("Dec31", "31.12.1990")):
+            book.add_record(make_record(name, birthday))
+        with mock.patch.object(virtual_assistant, "date", FakeDate):
+            names = self.upcoming_names(book)
+        self.assertEqual(names, ["Dec", "Dec31", "NewYear", "Jan"])
+
+    def test_bulk_add(self):
+        book = AddressBook()
+        book.add_record(make_record("Amy", "01.02.2000"))
+        book.bulk_add([
+            make_record("Amy", "05.06.2000"),
+            make_record("Bob", "01.02.2000"),
+            make_record("Eve"),
+        ])
+        self.assertIndexConsistent(book)
+
+    def test_bulk_add_keeps_insertion_order(self):
+        one_by_one = AddressBook()
+        for name in ("Zed", "Amy"):
+            one_by_one.add_record(make_record(name, tomorrow()))
+        bulk = AddressBook()
+        bulk.bulk_add([make_record("Zed", tomorrow()), make_record("Amy", tomorrow())])
+        self.assertEqual(bulk._birthday_names, ["Zed", "Amy"])
+        self.assertEqual(bulk._birthday_names, one_by_one._birthday_names)
+
+    def test_bulk_add_indexes_records_added_before_error(self):
+        def records():
+            yield make_record("Amy", tomorrow())
+            yield make_record("Bob", "31.02.2000")
+
+        book = AddressBook()
+        with self.assertRaises(ValueError):
+            book.bulk_add(records())
+        self.assertIndexConsistent(book)
+        self.assertEqual(self.upcoming_names(book), ["Amy"])
+
+    def test_dict_operations(self):
+        book = AddressBook({"Amy": make_record("Amy", tomorrow())})
+        self.assertEqual(self.upcoming_names(book), ["Amy"])
+        book["Bob"] = make_record("Bob", tomorrow())
+        del book["Amy"]
+        self.assertIndexConsistent(book)
+        self.assertEqual(self.upcoming_names(book), ["Bob"])
+        copied = book.copy()
+        self.assertIsInstance(copied, AddressBook)
+        self.assertEqual(self.upcoming_names(copied), ["Bob"])
+        book.pop("Bob")
+        book.update({"Eve": make_record("Eve", "01.02.2000")})
+        self.assertIndexConsistent(book)
+        book.clear()
+        self.assertIndexConsistent(book)
+
+    def test_copy_module_gets_own_index(self):
+        book = AddressBook()
+        book.add_record(make_record("Amy", "01.02.2000"))
+        copied = copy.copy(book)
+        copied.add_record(make_record("Bob", "01.02.2000"))
+        self.assertNotIn("Bob", book._birthday_names)
+        self.assertIndexConsistent(book)
+        self.assertIndexConsistent(copied)
+
+
+class AddressBookLookupTest(unittest.TestCase):
+    """Перевіряє find і delete."""
+
+    def test_find_and_delete_by_equal_string(self):
+        book = AddressBook()
+        book.add_record(make_record("Amy"))
+        name = "".join(["A", "my"])
+        self.assertIsNotNone(book.find(name))
+        self.assertTrue(book.delete(name))
+        self.assertIsNone(book.find(name))
+
+    def test_non_string_name(self):
+        book = AddressBook()
+        self.assertIsNone(book.find(42))
+        self.assertFalse(book.delete(42))
+
+
+class UpcomingBirthdaysCacheTest(unittest.TestCase):
+    """Перевіряє кеш get_upcoming_birthdays."""
+
+    def test_mutating_result_does_not_affect_cache(self):
+        book = AddressBook()
+        book.add_record(make_record("Amy", tomorrow()))
+        book.get_upcoming_birthdays().clear()
+        self.assertEqual(len(book.get_upcoming_birthdays()), 1)
+        book.get_upcoming_birthdays()[0]['name'] = "HACK"
+        self.assertEqual(book.get_upcoming_birthdays()[0]['name'], "Amy")
+
+    def test_cache_invalidated_by_birthday_assignment(self):
+        book = AddressBook()
+        record = make_record("Amy", tomorrow())
+        book.add_record(record)
+        self.assertEqual(len(book.get_upcoming_birthdays()), 1)
+        record.birthday = None
+        self.assertEqual(book.get_upcoming_birthdays(), [])
+
+    def test_cache_invalidated_by_changes(self):
+        book = AddressBook()
+        book.add_record(make_record("Amy", tomorrow()))
+        self.assertEqual(len(book.get_upcoming_birthdays()), 1)
+        book.add_record(make_record("Bob", tomorrow()))
+        self.assertEqual(len(book.get_upcoming_birthdays()), 2)
+        del book["Amy"]
+        self.assertEqual(len(book.get_upcoming_birthdays()), 1)
+
+
+class RecordPhonesTest(unittest.TestCase):
+    """Перевіряє роботу з телефонами запису."""
+
+    def test_edit_phone_keeps_position(self):
+        record = Record("Amy")
+        record.add_phone("1111111111")
+        record.add_phone("2222222222")
+        self.assertTrue(record.edit_phone("1111111111", "3333333333"))
+        self.assertEqual(list(record.phones), ["3333333333", "2222222222"])
+        self.assertEqual(str(record), "Amy: phones=[3333333333; 2222222222], birthday=—")
+
+    def test_edit_phone_to_existing_number(self):
+        record = Record("Amy")
+        record.add_phone("1111111111")
+        record.add_phone("2222222222")
+        with self.assertRaisesRegex(ValueError, "already added"):
+            record.edit_phone("1111111111", "2222222222")
+        self.assertEqual(list(record.phones), ["1111111111", "2222222222"])
+
+    def test_edit_missing_phone(self):
+        record = Record("Amy")
+        self.assertFalse(record.edit_phone("1111111111", "2222222222"))
+
+
+class BirthdayTest(unittest.TestCase):
+    """Перевіряє розбір і валідацію дати народження."""
+
+    def test_valid_date(self):
+        birthday = Birthday("29.02.2000")
+        self.assertEqual((birthday.day, birthday.month), (29, 2))
+
+    def test_invalid_format(self):
+        for value in ("1.1.2000", "99.99.2000", "00.01.2000", "aa.bb.cccc"):
+            with self.assertRaisesRegex(ValueError, "Invalid date format"):
+                Birthday(value)
+
+    def test_nonexistent_day(self):
+        for value in ("31.02.2000", "29.02.2001", "31.04.2000", "01.01.0000"):
+            with self.assertRaisesRegex(ValueError, "does not exist"):
+                Birthday(value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,65 @@
+import calendar
+import re
+import sys
+from bisect import bisect_left, bisect_right
 from collections import UserDict
-from datetime import datetime, timedelta, date
+from collections.abc import Iterable
+from datetime import MINYEAR, datetime, date
+from functools import lru_cache
+from operator import itemgetter
 
 PHONE_LENGTH = 10
 DATE_FORMAT = "%d.%m.%Y"
 WEEKEND_DAYS = 5  # Saturday = 5, Sunday = 6
 DAYS_IN_WEEK = 7
+DATE_CACHE_SIZE = 4096
+
+# Формат DATE_FORMAT (DD.MM.YYYY) з допустимими днем і місяцем для перевірки перед strptime
+_DATE_RE = re.compile(r"\A(0[1-9]|[12][0-9]|3[01])\.(0[1-9]|1[0-2])\.([0-9]{4})\Z")
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date(value: str) -> date:
+    """Перетворює рядок DATE_FORMAT у date; результат кешується."""
+    return datetime.strptime(value, DATE_FORMAT).date()
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _format_date(value: date) -> str:
+    """Перетворює date у рядок DATE_FORMAT; результат кешується."""
+    return value.strftime(DATE_FORMAT)
+
+
+def _upcoming_dicts(entries: Iterable[tuple[str, str]]) -> list[dict]:
+    """
+    Будує новий список словників результату get_upcoming_birthdays
+    з незмінних пар (ім'я, дата привітання), що зберігаються в кеші.
+    """
+    return [
+        {'name': name, 'congratulation_date': congratulation_date}
+        for name, congratulation_date in entries
+    ]
+
+
+def _birthday_key(month: int, day: int) -> int:
+    """Ключ дня народження в межах року для сортованого індексу."""
+    return month * 32 + day
+
+
+def _birthday_ordinal(year: int, month: int, day: int) -> int:
+    """
+    Повертає порядковий номер (toordinal) дня народження у вказаному році.
+    29 лютого у невисокосний рік переноситься на 28 лютого.
+    """
+    try:
+        return date(year, month, day).toordinal()
+    except ValueError:
+        return date(year, month, day - 1).toordinal()
 
 
 class Field:
     """Базовий клас для полів запису."""
+    __slots__ = ("value",)
     
     def __init__(self, value):
         self.value = value
@@ -18,10 +69,12 @@ class Field:
 
 class Name(Field):
     """Клас для зберігання імені контакту. Обов'язкове поле."""
-    pass
+    __slots__ = ()
 
 class Phone(Field):
     """Клас для зберігання номера телефону. Має валідацію формату (PHONE_LENGTH цифр)."""
+    __slots__ = ()
+
     def __init__(self, phone_number):
         self._validate_phone(phone_number)
         super().__init__(phone_number)
@@ -30,19 +83,28 @@ class Phone(Field):
         """Перевіряє, що номер телефону є строкою з необхідної кількості цифр."""
         if not isinstance(phone_number, str):
             raise ValueError("Phone must be a string.")
-        if not phone_number.isdigit():
-            raise ValueError("Phone must contain only digits.")
-        if len(phone_number) != PHONE_LENGTH:
+        # isascii() потрібен, бо isdigit() пропускає, наприклад, '²'
+        if not (len(phone_number) == PHONE_LENGTH
+                and phone_number.isascii() and phone_number.isdigit()):
             raise ValueError(f"Phone must be exactly {PHONE_LENGTH} digits")
         
 
 class Birthday(Field):
     """Клас для зберігання дати народження контакту."""
+    __slots__ = ("month", "day")
+
     def __init__(self, value):
-        try:
-            self.value = datetime.strptime(value, DATE_FORMAT).date()
-        except ValueError:
+        match = _DATE_RE.match(value) if isinstance(value, str) else None
+        if match is None:
             raise ValueError(f"Invalid date format. Use {DATE_FORMAT}")
+        # день (01-31) і місяць (01-12) перевірено регуляркою;
+        # лишається перевірити рік і чи є такий день у цьому місяці (31.04, 29.02.2001)
+        day, month, year = map(int, match.groups())
+        if year < MINYEAR or day > calendar.monthrange(year, month)[1]:
+            raise ValueError(f"Invalid date: {value} does not exist.")
+        self.value = _parse_date(value)
+        self.month = self.value.month
+        self.day = self.value.day
 
 
 
@@ -51,112 +113,321 @@ class Record:
     Клас для зберігання інформації про контакт, 
     включаючи ім'я, список телефонів та день народження.
     """
+    __slots__ = ("name", "phones", "_birthday", "_book", "_phones_str")
+
     def __init__(self, name):
         self.name = Name(name)
-        self.phones = []
-        self.birthday = None
+        self.phones: dict[str, Phone] = {}
+        # AddressBook, що індексує день народження запису; оновлюється при його зміні
+        self._book = None
+        self._birthday = None
+        # кешований рядок телефонів для __str__; None - треба перебудувати
+        self._phones_str = None
 
     def add_phone(self, phone_raw: str) -> None:
         """
         Створює обʼєкт класу Phone та 
-        додає номер телефону в список self.phones
+        додає номер телефону в словник self.phones
         """
-        if self.find_phone(phone_raw):
+        if phone_raw in self.phones:
             raise ValueError("This phone is already added.")
         else:
-            new_phone = Phone(phone_raw)
-            self.phones.append(new_phone)
+            self.phones[phone_raw] = Phone(phone_raw)
+            self._phones_str = None
     
     def find_phone(self, phone: str) -> Phone | None:
         """Повертає об’єкт Phone або None, якщо не знайдено."""
-        for phone_obj in self.phones:
-            if phone_obj.value == phone:
-                return phone_obj
-        return None
+        return self.phones.get(phone)
 
     def remove_phone(self, phone_to_delete: str) -> bool:
         """Видаляє телефон; повертає True, якщо знайшов і видалив."""
-        for index, phone in enumerate(self.phones):
-            if phone.value == phone_to_delete:
-                self.phones.pop(index)
-                return True
-        return False
+        if self.phones.pop(phone_to_delete, None) is None:
+            return False
+        self._phones_str = None
+        return True
 
     def edit_phone(self, old_phone: str, new_phone: str) -> bool:
         """
         Замінює об’єкт Phone(old_phone) на Phone(new_phone);
         повертає True, якщо заміна відбулася, False інакше.
         """
-        for index, phone in enumerate(self.phones):
-            if phone.value == old_phone:
-                self.phones[index] = Phone(new_phone)
-                return True
-        return False
+        if old_phone not in self.phones:
+            return False
+        if new_phone != old_phone and new_phone in self.phones:
+            raise ValueError("This phone is already added.")
+        # валідуємо новий номер до заміни старого
+        phone = Phone(new_phone)
+        # перебудовуємо словник, щоб новий номер зайняв місце старого
+        self.phones = {
+            (new_phone if number == old_phone else number):
+                (phone if number == old_phone else phone_obj)
+            for number, phone_obj in self.phones.items()
+        }
+        self._phones_str = None
+        return True
     
+    @property
+    def birthday(self) -> Birthday | None:
+        return self._birthday
+
+    @birthday.setter
+    def birthday(self, value: Birthday | None) -> None:
+        """Змінює день народження та переіндексовує запис у книзі-власнику."""
+        if self._book is not None:
+            self._book._unindex_birthday(self)
+        self._birthday = value
+        if self._book is not None:
+            self._book._index_birthday(self)
+
     def add_birthday(self, birthday:str):
         """Додає день народження до контакту."""
         self.birthday = Birthday(birthday)
 
     def __str__(self):
-        phones = "; ".join(phone.value for phone in self.phones)
-        birthday = self.birthday.value.strftime(DATE_FORMAT) if self.birthday else "—"
+        if self._phones_str is None:
+            self._phones_str = "; ".join(self.phones)
+        phones = self._phones_str
+        birthday = _format_date(self.birthday.value) if self.birthday else "—"
         return f"{self.name.value}: phones=[{phones}], birthday={birthday}"
 
 
 
 
 class AddressBook(UserDict):
+    """
+    Словник записів за іменем контакту.
+    Записи, додані першими саме до цієї книги, належать їй: їхні дні народження
+    зберігаються в сортованому індексі, який оновлюється через Record.birthday.
+    Записи, що вже належать іншій книзі, перевіряються окремо при кожному запиті.
+    """
+    def __init__(self, *args, **kwargs):
+        # індекс днів народження у вигляді паралельних списків:
+        # відсортовані ключі днів народження та відповідні імена
+        self._birthday_keys: list[int] = []
+        self._birthday_names: list[str] = []
+        # імена записів, що належать іншій книзі (впорядкована множина)
+        self._shared_names: dict[str, None] = {}
+        # (дата, пари (ім'я, дата привітання)) останнього get_upcoming_birthdays;
+        # None - кеш недійсний
+        self._upcoming_cache: tuple[date, tuple[tuple[str, str], ...]] | None = None
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        """
+        Зберігає Record під його ім'ям та оновлює індекс днів народження.
+        Через цей метод проходять також update, setdefault та конструктор.
+        """
+        if name != record.name.value:
+            raise ValueError(f"Record must be stored under its name '{record.name.value}'.")
+        # інтернуємо ім'я, щоб пошук у словнику порівнював ключі за ідентичністю
+        name = sys.intern(name)
+        if name in self.data:
+            self._release(name)
+        self.data[name] = record
+        self._adopt(name, record)
+
+    def __delitem__(self, name: str) -> None:
+        """
+        Видаляє Record та його день народження з індексу.
+        Через цей метод проходять також pop та popitem.
+        """
+        self._release(name)
+        del self.data[name]
+
+    def __ior__(self, other):
+        # UserDict.__ior__ пише напряму в self.data, оминаючи індекс
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        """Видаляє всі записи та очищує індекс днів народження."""
+        for record in self.data.values():
+            if record._book is self:
+                record._book = None
+        self.data.clear()
+        self._shared_names.clear()
+        self._rebuild_birthday_index()
+
+    def copy(self) -> "AddressBook":
+        """Повертає нову AddressBook з тими самими записами та власним індексом."""
+        return self.__class__(self.data)
+
+    def __copy__(self) -> "AddressBook":
+        # UserDict.__copy__ копіює __dict__, і копія ділила б індекс з оригіналом
+        return self.copy()
+
     def add_record(self, record: Record) -> None:
         """Додає Record у словник під ключем імені контакту."""
-        self.data[record.name.value] = record
+        self[record.name.value] = record
+
+    def bulk_add(self, records: Iterable[Record]) -> None:
+        """
+        Додає багато записів за раз (наприклад, під час завантаження книги).
+        Індекс днів народження перебудовується одним сортуванням у кінці.
+        """
+        try:
+            for record in records:
+                name = sys.intern(record.name.value)
+                old_record = self.data.get(name)
+                if old_record is not None:
+                    if old_record._book is self:
+                        old_record._book = None
+                    self._shared_names.pop(name, None)
+                self.data[name] = record
+                if record._book is None:
+                    record._book = self
+                elif record._book is not self:
+                    self._shared_names[name] = None
+        finally:
+            # індексуємо й ті записи, що додані до помилки в records
+            self._rebuild_birthday_index()
 
     def find(self, name: str) -> Record | None:
         """Повертає Record за точним ім’ям або None, якщо не знайдено."""
-        return self.data.get(name)
+        if not isinstance(name, str):
+            return None
+        return self.data.get(sys.intern(name))
         
     def delete(self, name: str) -> bool:
         """
         Видаляє Record за ім’ям.
         Повертає True, якщо контакт був, і False, якщо не було такого ключа.
         """
-        if name in self.data:
-            del self.data[name]
-            return True
-        return False
-    
+        if not isinstance(name, str):
+            return False
+        name = sys.intern(name)
+        if name not in self.data:
+            return False
+        del self[name]
+        return True
+
+    def _adopt(self, name: str, record: Record) -> None:
+        """Бере щойно доданий запис в індекс або, якщо він чужий, у _shared_names."""
+        if record._book is None:
+            record._book = self
+            self._index_birthday(record)
+        elif record._book is not self:
+            # інша книга не повідомить цю про зміну дня народження
+            self._shared_names[name] = None
+            self._upcoming_cache = None
+
+    def _release(self, name: str) -> None:
+        """Прибирає запис під ім'ям name з індексу перед видаленням або заміною."""
+        record = self.data[name]
+        if record._book is self:
+            self._unindex_birthday(record)
+            record._book = None
+        elif name in self._shared_names:
+            del self._shared_names[name]
+            self._upcoming_cache = None
+
+    def _rebuild_birthday_index(self) -> None:
+        """Будує індекс днів народження заново з усіх записів, що належать книзі."""
+        # сортуємо лише за ключем (стабільно), щоб зберегти порядок додавання,
+        # як і при вставці через _index_birthday
+        entries = sorted(
+            ((_birthday_key(record.birthday.month, record.birthday.day), name)
+             for name, record in self.data.items()
+             if record._book is self and record.birthday is not None),
+            key=itemgetter(0),
+        )
+        self._birthday_keys = [key for key, _ in entries]
+        self._birthday_names = [name for _, name in entries]
+        self._upcoming_cache = None
+
+    def _index_birthday(self, record: Record) -> None:
+        """Додає день народження запису до індексу."""
+        if record.birthday is not None:
+            key = _birthday_key(record.birthday.month, record.birthday.day)
+            index = bisect_right(self._birthday_keys, key)
+            self._birthday_keys.insert(index, key)
+            self._birthday_names.insert(index, record.name.value)
+            self._upcoming_cache = None
+
+    def _unindex_birthday(self, record: Record) -> None:
+        """Видаляє день народження запису з індексу."""
+        if record.birthday is not None:
+            key = _birthday_key(record.birthday.month, record.birthday.day)
+            start = bisect_left(self._birthday_keys, key)
+            end = bisect_right(self._birthday_keys, key, start)
+            try:
+                index = self._birthday_names.index(record.name.value, start, end)
+            except ValueError:
+                return
+            del self._birthday_keys[index]
+            del self._birthday_names[index]
+            self._upcoming_cache = None
+
+    def _birthday_window(self, start_key: int, end_key: int) -> list[str]:
+        """Повертає імена з ключами днів народження від start_key до end_key включно."""
+        keys = self._birthday_keys
+        names = self._birthday_names
+        start = bisect_left(keys, start_key)
+        end = bisect_right(keys, end_key)
+        if start_key <= end_key:
+            return names[start:end]
+        # вікно переходить через новий рік
+        return names[start:] + names[:end]
 
     def get_upcoming_birthdays(self) -> list:
-        """Повертає список днів народження на наступні 7 днів."""
+        """
+        Повертає список днів народження на наступні 7 днів.
+        Результат кешується до зміни дати або днів народження в книзі.
+        """
         today = date.today()
-        upcoming_birthdays = []
-
-        for name, record in self.data.items():
-            # Пропускаємо, якщо дня народження немає
-            if record.birthday is None:
+        if self._upcoming_cache is not None and self._upcoming_cache[0] == today:
+            return _upcoming_dicts(self._upcoming_cache[1])
+        today_ord = today.toordinal()
+        last_day = date.fromordinal(today_ord + DAYS_IN_WEEK)
+        start_key = _birthday_key(today.month, today.day)
+        # +1 день запасу: 29 лютого у невисокосний рік святкується 28 лютого
+        end_key = _birthday_key(last_day.month, last_day.day) + 1
+        # розглядаємо лише контакти, чиї дні народження потрапляють у вікно,
+        # та записи інших книг, яких немає в індексі
+        candidates = self._birthday_window(start_key, end_key)
+        if self._shared_names:
+            candidates += self._shared_names
+        # результат не довший за список кандидатів, тому виділяємо місце одразу
+        upcoming_birthdays = [None] * len(candidates)
+        count = 0
+
+        for name in candidates:
+            record = self.data.get(name)
+            # пропускаємо імена, яких уже немає в книзі
+            if record is None or record.birthday is None:
                 continue
-            # створюємо змінну birthday, яка дорівнює дню народження юзера
-            birthday = record.birthday.value
-            # визначаємо дату народження в цьому році
-            birthday_this_year = birthday.replace(year=today.year)
+            birthday = record.birthday
+            # визначаємо день народження в цьому році як порядковий номер дня
+            birthday_ord = _birthday_ordinal(today.year, birthday.month, birthday.day)
             # якщо день народження пройшов, маємо розглянути наступний рік
-            if birthday_this_year < today:
-                birthday_this_year = birthday.replace(year=today.year + 1)  
+            if birthday_ord < today_ord:
+                birthday_ord = _birthday_ordinal(today.year + 1, birthday.month, birthday.day)
             # виводимо різницю між датами
-            days_until_birthday = (birthday_this_year - today).days
+            days_until_birthday = birthday_ord - today_ord
             if 0 <= days_until_birthday <= DAYS_IN_WEEK:
-                # визначаємо дату привітання
-                congratulation_date = birthday_this_year
+                # визначаємо день привітання (ordinal 1 - понеділок, 01.01.0001)
+                congratulation_ord = birthday_ord
+                weekday = (congratulation_ord + 6) % DAYS_IN_WEEK
                 # перевірка на вихідні 
-                if congratulation_date.weekday() >= WEEKEND_DAYS:  
+                if weekday >= WEEKEND_DAYS:  
                     # переносимо дату привітання на понеділок
-                    days_to_monday = DAYS_IN_WEEK - congratulation_date.weekday()
-                    congratulation_date = congratulation_date + timedelta(days=days_to_monday)
+                    congratulation_ord += DAYS_IN_WEEK - weekday
+                congratulation_date = date.fromordinal(congratulation_ord)
                 # додаємо в список з днями народженнями
-                upcoming_birthdays.append({
-                    'name': name,
-                    'congratulation_date': congratulation_date.strftime(DATE_FORMAT)
-                })
-        return upcoming_birthdays
+                upcoming_birthdays[count] = (birthday_ord, name, _format_date(congratulation_date))
+                count += 1
+        del upcoming_birthdays[count:]
+        if self._shared_names:
+            # записи інших книг додано в кінець; впорядковуємо за датою (стабільно)
+            upcoming_birthdays.sort(key=itemgetter(0))
+        entries = tuple(
+            (name, congratulation_date)
+            for _, name, congratulation_date in upcoming_birthdays
+        )
+        # записи інших книг не повідомляють про зміни, тому з ними не кешуємо
+        if not self._shared_names:
+            self._upcoming_cache = (today, entries)
+        return _upcoming_dicts(entries)
 
 
 
@@ -186,7 +457,9 @@ def parse_input(user_input):
     """
     if user_input:
         cmd, *args = user_input.split()
-        cmd = cmd.strip().lower()
+        # split() вже прибрав пробіли; lower() лише якщо команда не в нижньому регістрі
+        if not (cmd.isascii() and cmd.islower()):
+            cmd = cmd.lower()
         return cmd, *args
     else:
         return None, None
@@ -203,7 +476,7 @@ def add_birthday(args, book: AddressBook):
         return f"Contact '{name}' created with birthday {birthday}."
     else:
         if record.birthday is not None:
-            old_birthday = record.birthday.value.strftime(DATE_FORMAT)
+            old_birthday = _format_date(record.birthday.value)
             record.add_birthday(birthday)
             return f"Birthday for '{name}' updated from {old_birthday} to {birthday}."
         else:
@@ -217,7 +490,7 @@ def show_birthday(args, book: AddressBook):
     record = book.find(name)
     if record:
         if record.birthday:
-            return f"Birthday of {name} is {record.birthday.value.strftime(DATE_FORMAT)}"
+            return f"Birthday of {name} is {_format_date(record.birthday.value)}"
         else:
             return f"Error: Contact '{name}' has no birthday."
     return f"Error: Contact '{name}' not found."
@@ -229,10 +502,10 @@ def birthdays(book: AddressBook):
     if not upcoming_birthdays:
         return "No upcoming birthdays."
     
-    result = ["Upcoming birthdays:"]
-    for birthday in upcoming_birthdays:
-        result.append(f"{birthday['name']}: {birthday['congratulation_date']}")
-    return "\n".join(result)
+    return "Upcoming birthdays:\n" + "\n".join(
+        f"{birthday['name']}: {birthday['congratulation_date']}"
+        for birthday in upcoming_birthdays
+    )
 
 @input_error
 def add_contact(args, book: AddressBook):
@@ -292,8 +565,7 @@ def show_phone(args, book: AddressBook):
     record = book.find(name)
     if record:
         if record.phones:
-            phones = [phone.value for phone in record.phones]  
-            return f"Phones of {name}: {', '.join(phones)}"
+            return f"Phones of {name}: {', '.join(record.phones)}"
         else:
             return f"Contact '{name}' has no phones."
     return f"Error: Contact '{name}' not found."
@@ -303,11 +575,16 @@ def show_all(book: AddressBook):
     """Показує всі контакти з телефонами та днями народження."""
     if not book.data:
         return "No contacts found."
-    contacts_list = []
-    for name, record in book.data.items():
-        contacts_list.append(str(record))
-    
-    return "\n".join(contacts_list)
+    return "\n".join(str(record) for record in book.data.values())
+
+
+# Сигнал для main, що роботу бота треба завершити
+_EXIT = object()
+
+
+def _invalid(args, book: AddressBook):
+    """Відповідь на невідому команду."""
+    return "Invalid command."
 
 
 def main():
@@ -315,6 +592,10 @@ def main():
     
     # Словник команд з lambda функціями
     commands = {
+        None: lambda args, book: "Enter a command.",
+        "hello": lambda args, book: "How can I help you?",
+        "close": lambda args, book: _EXIT,
+        "exit": lambda args, book: _EXIT,
         "add": add_contact,
         "change": change_contact,
         "phone": show_phone,
@@ -330,25 +611,11 @@ def main():
         user_input = input("Enter a command: ")
         command, *args = parse_input(user_input)
         
-        if command is None:
-            print("Enter a command.")
-            continue
-        
-        if command in ["close", "exit"]:
+        result = commands.get(command, _invalid)(args, book)
+        if result is _EXIT:
             print("Good bye!")
             break
-        
-        if command == "hello":
-            print("How can I help you?")
-
-        elif command in commands:
-            print(commands[command](args, book))
-
-        else:
-            print("Invalid command.")
-
-
-
+        print(result)
 
 
 if __name__ == "__main__":